@@ -1,7 +1,26 @@
+import argparse
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
 import pandas as pd
 import yfinance as yf
 import backtrader as bt
 
+try:
+    import talib
+except ImportError:  # TA-Lib is optional; indicators fall back to pandas
+    talib = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # ------------------------------
 # 1. Download Historical Data
 # ------------------------------
@@ -9,58 +28,324 @@ tickers = ["AAPL", "MSFT"]
 start_date = "2020-01-01"
 end_date = "2024-12-31"
 
-data_dict = {}
-for ticker in tickers:
-    df = yf.download(ticker, start=start_date, end=end_date)
-    df.columns = [col[0] if isinstance(col, tuple) else col for col in df.columns]
-    keep_cols = [col for col in ['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close'] if col in df.columns]
-    df = df[keep_cols]
-    df.index = pd.to_datetime(df.index)
-    data_dict[ticker] = df
+
+CACHE_DIR = "cache"
+# The strategies read High/Low (ATR) and Close, and Backtrader's broker
+# fills market orders at the next bar's Open, so Open must stay too.
+# Volume and Adj Close are dropped at load time; prices are kept as float32.
+PRICE_COLS = ['Open', 'High', 'Low', 'Close']
+
+
+def download(tickers, start_date, end_date):
+    # One batched request for every ticker instead of a round-trip each
+    raw = yf.download(tickers, start=start_date, end=end_date,
+                      group_by='ticker', threads=True, auto_adjust=False)
+    data_dict = {}
+    for ticker in tickers:
+        # yfinance does not raise on failures (no network, unknown ticker);
+        # it hands back an empty frame, possibly without the ticker's columns
+        try:
+            df = raw[ticker] if isinstance(raw.columns, pd.MultiIndex) else raw
+            df = df[PRICE_COLS]
+        except KeyError:
+            df = raw.iloc[0:0]
+        # A single NaN price would poison every later value of the
+        # recursive EMA kernels, so drop any row with a missing price
+        df = df.dropna(subset=PRICE_COLS)
+        if df.empty:
+            warnings.warn(f"yfinance returned no data for {ticker} ({start_date} to {end_date})")
+            continue
+        df = df.astype('float32')
+        df.index = pd.to_datetime(df.index)
+        data_dict[ticker] = df
+    return data_dict
+
+
+def load_data(tickers, start_date, end_date):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_paths = {ticker: os.path.join(CACHE_DIR, f"{ticker}_{start_date}_{end_date}.parquet")
+                   for ticker in tickers}
+    range_end = pd.Timestamp(end_date)
+    # end_date is exclusive; the last bar we can expect is the business day
+    # before it (exchange holidays are handled by the mtime check below)
+    last_needed = range_end - pd.offsets.BDay(1)
+
+    data_dict = {}
+    missing = []
+    stale = []
+    for ticker in tickers:
+        df = None
+        if os.path.exists(cache_paths[ticker]):
+            df = pd.read_parquet(cache_paths[ticker], columns=PRICE_COLS).astype('float32')
+        # An empty file (left by an older failed download) counts as missing
+        if df is None or df.empty:
+            missing.append(ticker)
+            continue
+        data_dict[ticker] = df
+        # Only a cache written before end_date had closed can be missing
+        # bars; once written after the range closed it is final
+        written = pd.Timestamp(os.path.getmtime(cache_paths[ticker]), unit='s')
+        if written.normalize() < range_end and df.index.max() < last_needed:
+            stale.append(ticker)
+
+    if missing:
+        for ticker, df in download(missing, start_date, end_date).items():
+            df.to_parquet(cache_paths[ticker])
+            data_dict[ticker] = df
+
+    if stale:
+        delta_start = min(data_dict[t].index.max() for t in stale) + pd.Timedelta(days=1)
+        deltas = download(stale, delta_start.strftime("%Y-%m-%d"), end_date)
+        for ticker in stale:
+            df = data_dict[ticker]
+            delta = deltas.get(ticker)
+            if delta is not None:
+                delta = delta[delta.index > df.index.max()]
+            if delta is not None and len(delta):
+                df = pd.concat([df, delta])
+                df.to_parquet(cache_paths[ticker])
+                data_dict[ticker] = df
+            elif df.index.max() >= last_needed - pd.offsets.BDay(1):
+                # Nothing new and only a holiday-sized gap: bump the mtime so
+                # a closed range is not re-checked on every run. Wider gaps
+                # stay stale, since the download itself may have failed.
+                os.utime(cache_paths[ticker])
+
+    # Tickers that could not be downloaded are left out (with a warning)
+    return {ticker: data_dict[ticker] for ticker in tickers if ticker in data_dict}
 
 # ------------------------------
-# 2. Enhanced Strategy
+# 2. Vectorized Signal Engine
+# ------------------------------
+# Kernels are compiled eagerly for one explicit signature each, so the JIT
+# cost is paid (or loaded from the on-disk cache) at import time rather
+# than on the first timed call, and there is no type dispatch per call.
+@njit('void(f4[::1], f4[::1], f4[::1], f4[::1], f4[::1], f4[::1])', cache=True, fastmath=True)
+def fused_indicators(close, alphas, out_short, out_long, out_macd, out_sig):
+    # Short/long EMA, MACD (EMA12 - EMA26) and its EMA9 signal line in a
+    # single pass over close. alphas holds the smoothing factors for the
+    # short, long, 12, 26 and 9 spans; each recurrence matches
+    # ewm(alpha=..., adjust=False).
+    n = len(close)
+    if n == 0:
+        return
+    a_s, a_l, a_12, a_26, a_9 = alphas[0], alphas[1], alphas[2], alphas[3], alphas[4]
+    one = np.float32(1.0)
+
+    e_s = e_l = e_12 = e_26 = close[0]
+    sig = np.float32(0.0)
+    for i in range(n):
+        x = close[i]
+        if i > 0:
+            e_s = a_s * x + (one - a_s) * e_s
+            e_l = a_l * x + (one - a_l) * e_l
+            e_12 = a_12 * x + (one - a_12) * e_12
+            e_26 = a_26 * x + (one - a_26) * e_26
+        m = e_12 - e_26
+        sig = m if i == 0 else a_9 * m + (one - a_9) * sig
+
+        out_short[i] = e_s
+        out_long[i] = e_l
+        out_macd[i] = m
+        out_sig[i] = sig
+
+
+def compute_indicators(df, short_period=8, long_period=21, rsi_period=14, atr_period=14):
+    close = df['Close']
+
+    if talib is not None:
+        c = close.to_numpy(dtype=np.float64)
+        macd, macd_signal, _ = talib.MACD(c, 12, 26, 9)
+        return pd.DataFrame({
+            'short_ema': talib.EMA(c, short_period),
+            'long_ema': talib.EMA(c, long_period),
+            'rsi': talib.RSI(c, rsi_period),
+            'macd': macd,
+            'macd_signal': macd_signal,
+            'atr': talib.ATR(df['High'].to_numpy(dtype=np.float64),
+                             df['Low'].to_numpy(dtype=np.float64),
+                             c, atr_period),
+        }, index=df.index)
+
+    # EMAs and MACD (12, 26, 9) from one fused pass over close
+    c = np.array(close.to_numpy(), dtype=np.float32, order='C')  # copy: CoW views are read-only
+    spans = np.array([short_period, long_period, 12, 26, 9], dtype=np.float64)
+    alphas = (2.0 / (spans + 1.0)).astype(np.float32)
+    out = np.empty((4, len(c)), dtype=np.float32)
+    fused_indicators(c, alphas, out[0], out[1], out[2], out[3])
+    short_ema, long_ema, macd, macd_signal = (pd.Series(o, index=df.index) for o in out)
+
+    # RSI with Wilder smoothing (alpha = 1 / period)
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / rsi_period, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / rsi_period, adjust=False).mean()
+    rsi = 100 - 100 / (1 + gain / loss)
+
+    # ATR with Wilder smoothing over the true range
+    prev_close = close.shift()
+    true_range = pd.concat([df['High'] - df['Low'],
+                            (df['High'] - prev_close).abs(),
+                            (df['Low'] - prev_close).abs()], axis=1).max(axis=1)
+    atr = true_range.ewm(alpha=1 / atr_period, adjust=False).mean()
+
+    ind = pd.DataFrame({
+        'short_ema': short_ema,
+        'long_ema': long_ema,
+        'rsi': rsi,
+        'macd': macd,
+        'macd_signal': macd_signal,
+        'atr': atr,
+    }, index=df.index)
+
+    # The recursive EMA/Wilder smoothing produces values from bar 0; blank
+    # out the warmup so no signal fires before every indicator is primed,
+    # matching Backtrader's minperiod and TA-Lib's NaN lookback.
+    warmup = max(short_period, long_period, 26 + 9 - 1, atr_period + 1, rsi_period + 1)
+    ind.iloc[:warmup - 1] = np.nan
+    return ind
+
+
+def signal_masks(ind, rsi_threshold=45):
+    # Entry: bullish EMA cross confirmed by RSI and MACD; exit: bearish cross
+    entry = ((ind['short_ema'] > ind['long_ema']) &
+             (ind['rsi'] > rsi_threshold) &
+             (ind['macd'] > ind['macd_signal'])).to_numpy()
+    bearish = (ind['short_ema'] < ind['long_ema']).to_numpy()
+    return entry, bearish
+
+
+def run_vectorized(df, short_period=8, long_period=21, rsi_period=14, rsi_threshold=45):
+    ind = compute_indicators(df, short_period, long_period, rsi_period)
+    entry, exit_ = signal_masks(ind, rsi_threshold)
+
+    # Long from an entry bar until the next bearish cross: mark state changes,
+    # forward-fill them, and treat everything before the first entry as flat.
+    state = np.where(entry, 1.0, np.where(exit_, 0.0, np.nan))
+    positions = pd.Series(state, index=df.index).ffill().fillna(0.0)
+
+    # Position is taken at the close, so it earns the next bar's return
+    returns = positions.shift().fillna(0.0) * df['Close'].pct_change().fillna(0.0)
+
+    ind['position'] = positions
+    ind['returns'] = returns
+    ind['pnl'] = returns.cumsum()
+    return ind
+
+
+@njit('f8[::1](f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8, f8, f8)',
+      cache=True)
+def _simulate_stops(close, short_ema, long_ema, rsi, macd, sig, atr, cash0, risk,
+                    rsi_threshold):
+    # Same entry/exit rules as EnhancedEMAStrategy with its default 2/3 ATR
+    # stop/take-profit and fixed-fractional sizing, but not a broker replay:
+    # orders fill at the signal bar's close (Backtrader fills at the next
+    # open) and no commission is charged, so final values will differ.
+    n = len(close)
+    equity_curve = np.empty(n)
+    cash = cash0
+    position_size = 0.0
+    stop_price = 0.0
+    take_profit = 0.0
+
+    for i in range(n):
+        price = close[i]
+
+        if position_size == 0.0:
+            if (short_ema[i] > long_ema[i] and
+                    rsi[i] > rsi_threshold and
+                    macd[i] > sig[i] and
+                    atr[i] > 0.0):
+                stop_price = price - 2 * atr[i]
+                take_profit = price + 3 * atr[i]
+
+                risk_amount = cash * risk
+                position_size = risk_amount / (price - stop_price)
+                cash -= position_size * price
+        else:
+            if (price <= stop_price or
+                    price >= take_profit or
+                    short_ema[i] < long_ema[i]):
+                cash += position_size * price
+                position_size = 0.0
+
+        equity_curve[i] = cash + position_size * price
+
+    return equity_curve
+
+
+def run_stops(df, cash0=100000.0, risk=0.02, short_period=8, long_period=21,
+              rsi_period=14, atr_period=14, rsi_threshold=45):
+    ind = compute_indicators(df, short_period, long_period, rsi_period, atr_period)
+
+    def f8(series):
+        # Always copy: under copy-on-write to_numpy() can hand back a
+        # read-only view, which the eager writable signature rejects
+        return np.array(series.to_numpy(), dtype=np.float64, order='C')
+
+    equity = _simulate_stops(
+        f8(df['Close']),
+        f8(ind['short_ema']),
+        f8(ind['long_ema']),
+        f8(ind['rsi']),
+        f8(ind['macd']),
+        f8(ind['macd_signal']),
+        f8(ind['atr']),
+        float(cash0),
+        float(risk),
+        float(rsi_threshold),
+    )
+    return pd.Series(equity, index=df.index, name='equity')
+
+# ------------------------------
+# 3. Enhanced Strategy
 # ------------------------------
 class EnhancedEMAStrategy(bt.Strategy):
+    # Indicator periods are fixed when the feed is built (see make_feed)
     params = dict(
-        short_period=8,
-        long_period=21,
-        rsi_period=14,
-        atr_period=14,
-        risk_per_trade=0.02  # 2% risk
+        risk_per_trade=0.02,  # 2% risk
+        stop_atr=2.0,         # stop-loss distance in ATRs
+        take_profit_atr=3.0,  # take-profit distance in ATRs
     )
 
+    # Per-trade state lives in slots rather than the instance __dict__
+    __slots__ = ('order', 'buy_price', 'stop_price', 'take_profit')
+
     def __init__(self):
-        self.short_ema = bt.indicators.EMA(self.data.close, period=self.p.short_period)
-        self.long_ema = bt.indicators.EMA(self.data.close, period=self.p.long_period)
-        self.rsi = bt.indicators.RSI(self.data.close, period=self.p.rsi_period)
-        self.macd = bt.indicators.MACD(self.data.close)
-        self.macd_signal = bt.indicators.MACD(self.data.close).signal
-        self.atr = bt.indicators.ATR(self.data, period=self.p.atr_period)
+        self.atr = self.data.atr
+        self.signal = self.data.signal
+        self.bearish = self.data.bearish
+
+        # Resolve line/broker lookups once instead of on every bar
+        self._close = self.data.close
+        self._broker = self.broker
 
         self.order = None
         self.buy_price = None
         self.stop_price = None
         self.take_profit = None
 
+    def notify_order(self, order):
+        # Release the pending-order guard once the order is resolved, so the
+        # strategy can exit after entering and re-enter after exiting
+        if order.status in (order.Completed, order.Canceled, order.Margin, order.Rejected):
+            self.order = None
+
     def next(self):
         if self.order:
             return
 
-        cash = self.broker.get_cash()
+        close = self._close[0]
 
         # ENTRY CONDITION
         if not self.position:
-            if (self.short_ema[0] > self.long_ema[0] and
-                self.rsi[0] > 45 and
-                self.macd.macd[0] > self.macd.signal[0]):
-
-                entry_price = self.data.close[0]
+            if self.signal[0]:
+                cash = self._broker.get_cash()
+                entry_price = close
                 atr = self.atr[0]
 
                 # ATR-based stop-loss & take-profit
-                self.stop_price = entry_price - 2 * atr
-                self.take_profit = entry_price + 3 * atr
+                self.stop_price = entry_price - self.p.stop_atr * atr
+                self.take_profit = entry_price + self.p.take_profit_atr * atr
 
                 # Position sizing (2% risk of portfolio)
                 risk_amount = cash * self.p.risk_per_trade
@@ -71,48 +356,163 @@ class EnhancedEMAStrategy(bt.Strategy):
 
         # EXIT CONDITION
         else:
-            if (self.data.close[0] <= self.stop_price or
-                self.data.close[0] >= self.take_profit or
-                self.short_ema[0] < self.long_ema[0]):
+            if (close <= self.stop_price or
+                close >= self.take_profit or
+                self.bearish[0]):
                 self.order = self.sell(size=self.position.size)
 
 # ------------------------------
-# 3. Backtest Setup
+# 4. Backtest Setup
 # ------------------------------
-cerebro = bt.Cerebro()
-cerebro.addstrategy(EnhancedEMAStrategy)
+START_CASH = 100000.0
+FEED_COLS = PRICE_COLS
+INDICATOR_COLS = ['short_ema', 'long_ema', 'rsi', 'macd', 'macd_signal', 'atr', 'signal', 'bearish']
+
+
+class IndicatorData(bt.feeds.PandasDirectData):
+    # Precomputed indicators ride along as extra lines, addressed by their
+    # itertuples() position after the DatetimeIndex and OHLC columns
+    lines = tuple(INDICATOR_COLS)
+    params = tuple((name, len(FEED_COLS) + 1 + i) for i, name in enumerate(INDICATOR_COLS)) + (
+        ('volume', -1),
+        ('openinterest', -1),
+    )
+
+
+def make_feed(df, short_period=8, long_period=21, rsi_period=14, atr_period=14, rsi_threshold=45):
+    # PandasDirectData reads rows positionally via itertuples(): index 0 is
+    # the DatetimeIndex, then Open, High, Low, Close, indicators.
+    ind = compute_indicators(df, short_period, long_period, rsi_period, atr_period)
+    entry, bearish = signal_masks(ind, rsi_threshold)
+    ind['signal'] = entry
+    ind['bearish'] = bearish
+    feed_df = pd.concat([df[FEED_COLS], ind[INDICATOR_COLS]], axis=1).astype('float32')
+    return IndicatorData(dataname=feed_df)
+
+
+OPT_GRID = dict(
+    risk_per_trade=[0.01, 0.02, 0.03],
+    stop_atr=[1.5, 2.0, 2.5, 3.0],
+    take_profit_atr=[2.0, 3.0, 4.0],
+)
+
 
-# Add analyzers
-cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name="sharpe", timeframe=bt.TimeFrame.Days, riskfreerate=0.0)
-cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
-cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
+def make_cerebro(ticker, df, plot=False):
+    # Observers only feed the plot; skip their per-bar bookkeeping otherwise
+    cerebro = bt.Cerebro(stdstats=plot, runonce=True, preload=True, optreturn=True)
 
-cerebro.broker.setcash(100000.0)
-cerebro.broker.setcommission(commission=0.001)
+    # Add analyzers
+    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name="sharpe", timeframe=bt.TimeFrame.Days, riskfreerate=0.0)
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
+    cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
 
-# Add data
-for ticker, df in data_dict.items():
-    df_bt = bt.feeds.PandasData(dataname=df)
+    cerebro.broker.setcash(START_CASH)
+    cerebro.broker.setcommission(commission=0.001)
+
+    # Add data
+    df_bt = make_feed(df)
     cerebro.adddata(df_bt, name=ticker)
+    return cerebro
 
-# Run backtest
-results = cerebro.run()
-strat = results[0]
 
-# ------------------------------
-# 4. Print Results
-# ------------------------------
-start_value = 100000.0
-end_value = cerebro.broker.getvalue()
-cagr = strat.analyzers.returns.get_analysis()["rnorm100"]
-sharpe = strat.analyzers.sharpe.get_analysis().get("sharperatio", None)
-max_dd = strat.analyzers.drawdown.get_analysis()["max"]["drawdown"]
-
-print(f"Initial Portfolio Value: {start_value:.2f}")
-print(f"Final Portfolio Value: {end_value:.2f}")
-print(f"CAGR: {cagr:.2f}%")
-print(f"Sharpe Ratio: {sharpe:.2f}")
-print(f"Max Drawdown: {max_dd:.2f}%")
-
-# Plot
-cerebro.plot(iplot=False, style="candlestick", volume=False, numfigs=2)
+def backtest_one(ticker, df, plot=False):
+    cerebro = make_cerebro(ticker, df, plot)
+    cerebro.addstrategy(EnhancedEMAStrategy)
+
+    # Run backtest
+    results = cerebro.run()
+    strat = results[0]
+
+    if plot:
+        # Render off-screen and save, so workers never block on a GUI window.
+        # backtrader.plot forces TkAgg when imported, so import it first and
+        # switch to Agg afterwards; plotter.show() is then a no-op.
+        import backtrader.plot  # noqa: F401
+        import matplotlib
+        matplotlib.use("Agg")
+        figs = cerebro.plot(iplot=False, style="candlestick", volume=False)
+        figs[0][0].savefig(f"run_{ticker}.png")
+
+    # Only plain floats go back to the parent process
+    return {
+        "end_value": cerebro.broker.getvalue(),
+        "sharpe": strat.analyzers.sharpe.get_analysis().get("sharperatio", None),
+        "max_dd": strat.analyzers.drawdown.get_analysis()["max"]["drawdown"],
+        "cagr": strat.analyzers.returns.get_analysis()["rnorm100"],
+    }
+
+
+def optimize_one(ticker, df, grid=OPT_GRID):
+    # One cerebro, one preloaded feed; Backtrader fans the parameter
+    # combinations out over its own worker pool. Indicator periods are baked
+    # into the feed lines, so the sweep covers sizing and stop placement.
+    cerebro = make_cerebro(ticker, df)
+    cerebro.optstrategy(EnhancedEMAStrategy, **grid)
+    results = cerebro.run(maxcpus=os.cpu_count(), optreturn=True)
+
+    rows = []
+    for run in results:
+        strat = run[0]
+        row = {name: getattr(strat.params, name) for name in grid}
+        row["sharpe"] = strat.analyzers.sharpe.get_analysis().get("sharperatio", None)
+        row["max_dd"] = strat.analyzers.drawdown.get_analysis()["max"]["drawdown"]
+        row["cagr"] = strat.analyzers.returns.get_analysis()["rnorm100"]
+        rows.append(row)
+
+    rows.sort(key=lambda r: float("-inf") if r["sharpe"] is None else r["sharpe"], reverse=True)
+    return rows
+
+
+def format_sharpe(sharpe):
+    # SharpeRatio reports None when a run never trades
+    return "n/a" if sharpe is None else f"{sharpe:.2f}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EMA/RSI/MACD backtest with ATR stops")
+    parser.add_argument("--plot", action="store_true", help="save each ticker's chart to run_<ticker>.png")
+    parser.add_argument("--optimize", action="store_true", help="sweep OPT_GRID for each ticker")
+    args = parser.parse_args()
+
+    data_dict = load_data(tickers, start_date, end_date)
+    if not data_dict:
+        raise SystemExit("No price data available; check the network connection and retry.")
+
+    if args.optimize:
+        for ticker, df in data_dict.items():
+            rows = optimize_one(ticker, df)
+            best = rows[0]
+            print(f"--- {ticker} (best of {len(rows)} combinations) ---")
+            print(f"Params: risk_per_trade={best['risk_per_trade']}, "
+                  f"stop_atr={best['stop_atr']}, take_profit_atr={best['take_profit_atr']}")
+            print(f"CAGR: {best['cagr']:.2f}%")
+            print(f"Sharpe Ratio: {format_sharpe(best['sharpe'])}")
+            print(f"Max Drawdown: {best['max_dd']:.2f}%")
+    else:
+        # Tickers are independent, so each one runs its own cerebro in a worker
+        summary = {}
+        max_workers = min(len(data_dict), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(backtest_one, ticker, df, args.plot): ticker
+                       for ticker, df in data_dict.items()}
+            for future in as_completed(futures):
+                summary[futures[future]] = future.result()
+
+        # ------------------------------
+        # 5. Print Results
+        # ------------------------------
+        for ticker in data_dict:
+            res = summary[ticker]
+            print(f"--- {ticker} ---")
+            print(f"Initial Portfolio Value: {START_CASH:.2f}")
+            print(f"Final Portfolio Value: {res['end_value']:.2f}")
+            print(f"CAGR: {res['cagr']:.2f}%")
+            print(f"Sharpe Ratio: {format_sharpe(res['sharpe'])}")
+            print(f"Max Drawdown: {res['max_dd']:.2f}%")
+
+        # Vectorized signal engine (no broker simulation: no stops, sizing or commission)
+        for ticker, df in data_dict.items():
+            vec = run_vectorized(df)
+            print(f"{ticker} Vectorized Signal PnL: {vec['pnl'].iloc[-1] * 100:.2f}%")
+            equity = run_stops(df)
+            print(f"{ticker} ATR Stop Simulation (close fills, no commission) Final Value: {equity.iloc[-1]:.2f}")